@@ -15,16 +15,440 @@ Usage:
 - Run the script and follow the on-screen menu options.
 """
 
+import functools
+import hashlib
 import os
+import re
 import sys
-import shutil
-import urllib.request
-import json
-import configparser
 
 # Version number
 __version__ = "1.0.0"
 
+# Buffer size used when copying user.js files and downloading updates
+COPY_BUFSIZE = 256 * 1024
+
+# user.js settings grouped by categories, one entry per optimization option.
+# Descriptions of the options are kept separately in get_category_docs(), in the same order.
+CATEGORY_SETTINGS = {
+    'Privacy Enhancements': (
+        # Enable First-Party Isolation
+        b'user_pref("privacy.firstparty.isolate", true);\n',
+        # Resist Fingerprinting
+        b'user_pref("privacy.resistFingerprinting", true);\n',
+        # Enable Global Privacy Control
+        b'user_pref("privacy.globalprivacycontrol.enabled", true);\n',
+        # Block Third-Party Cookies
+        (
+            b'user_pref("network.cookie.cookieBehavior", 1);\n'
+            b'user_pref("network.cookie.thirdparty.nonsecureSessionOnly", true);\n'
+        ),
+        # Disable Beacon API
+        b'user_pref("beacon.enabled", false);\n',
+        # Disable Search Suggestions
+        b'user_pref("browser.search.suggest.enabled", false);\n',
+        # Enable Strict Referrer Policy
+        b'user_pref("network.http.referer.XOriginPolicy", 2);\n',
+        # Disable Network Prediction
+        b'user_pref("network.predictor.enable-hover-on-ssl", false);\n',
+        # Disable Search Suggestions in URL Bar
+        b'user_pref("browser.urlbar.suggest.searches", false);\n',
+        # Disable Telemetry Coverage
+        b'user_pref("toolkit.coverage.opt-out", true);\n',
+        # Disable Battery Status API
+        b'user_pref("dom.battery.enabled", false);\n',
+        # Disable Sensor APIs
+        b'user_pref("device.sensors.enabled", false);\n',
+        # Disable Network Information API
+        b'user_pref("dom.netinfo.enabled", false);\n',
+        # Disable Resource Timing API
+        b'user_pref("dom.enable_resource_timing", false);\n',
+        # Disable Web Audio API
+        b'user_pref("dom.webaudio.enabled", false);\n',
+        # Disable Virtual Reality Devices
+        b'user_pref("dom.vr.enabled", false);\n',
+        # Disable Gamepad API
+        b'user_pref("dom.gamepad.enabled", false);\n',
+        # Disable Face Detection
+        b'user_pref("camera.control.face_detection.enabled", false);\n',
+    ),
+    'Security Improvements': (
+        # Enable HTTPS Only Mode
+        b'user_pref("dom.security.https_only_mode", true);\n',
+        # Set Minimum TLS Version to 1.2
+        b'user_pref("security.tls.version.min", 3);\n',
+        # Disable WebRTC (Prevent IP Leak)
+        (
+            b'user_pref("media.peerconnection.enabled", false);\n'
+            b'user_pref("media.peerconnection.use_document_iceservers", false);\n'
+            b'user_pref("media.peerconnection.video.enabled", false);\n'
+            b'user_pref("media.peerconnection.identity.timeout", 1);\n'
+            b'user_pref("media.peerconnection.turn.disable", true);\n'
+            b'user_pref("media.peerconnection.ice.no_host", true);\n'
+        ),
+        # Disable Geolocation
+        (
+            b'user_pref("geo.enabled", false);\n'
+            b'user_pref("geo.provider.use_corelocation", false);\n'
+            b'user_pref("geo.provider.ms-windows-location", false);\n'
+            b'user_pref("geo.provider.use_gpsd", false);\n'
+            b'user_pref("browser.search.geoip.url", "");\n'
+            b'user_pref("permissions.default.geo", 2);\n'
+        ),
+        # Disable JavaScript in PDF Viewer
+        b'user_pref("pdfjs.enableScripting", false);\n',
+        # Disable Remote JAR Files
+        b'user_pref("network.jar.block-remote-files", true);\n',
+        # Disable SSL Session Identifiers
+        b'user_pref("security.ssl.disable_session_identifiers", true);\n',
+        # Disable Password Manager Autofill
+        b'user_pref("signon.autofillForms", false);\n',
+        # Disable Third-Party Credentials
+        b'user_pref("network.http.sendRefererHeader", 0);\n',
+        # Disable Form Autofill Credit Cards
+        b'user_pref("extensions.formautofill.creditCards.available", false);\n',
+        # Disable Microphone Access
+        b'user_pref("permissions.default.microphone", 2);\n',
+        # Disable Camera Access
+        b'user_pref("permissions.default.camera", 2);\n',
+        # Disable Media Device Enumeration
+        (
+            b'user_pref("media.navigator.enabled", false);\n'
+            b'user_pref("media.navigator.permission.disabled", true);\n'
+            b'user_pref("media.navigator.video.enabled", false);\n'
+        ),
+        # Disable Speech Recognition
+        b'user_pref("media.webspeech.recognition.enable", false);\n',
+        # Disable Speech Synthesis
+        b'user_pref("media.webspeech.synth.enabled", false);\n',
+        # Disable WebGL Debug Info
+        b'user_pref("webgl.enable-debug-renderer-info", false);\n',
+    ),
+    'Performance Optimizations': (
+        # Disable Prefetching and Speculative Connections
+        (
+            b'user_pref("network.prefetch-next", false);\n'
+            b'user_pref("network.predictor.enabled", false);\n'
+            b'user_pref("network.predictor.enable-prefetch", false);\n'
+            b'user_pref("network.http.speculative-parallel-limit", 0);\n'
+            b'user_pref("browser.urlbar.speculativeConnect.enabled", false);\n'
+        ),
+        # Disable DNS Prefetching
+        (
+            b'user_pref("network.dns.disablePrefetch", true);\n'
+            b'user_pref("network.dns.disablePrefetchFromHTTPS", true);\n'
+        ),
+        # Disable IPv6
+        b'user_pref("network.dns.disableIPv6", true);\n',
+        # Disable HTTP2
+        b'user_pref("network.http.spdy.enabled", false);\n',
+        # Disable HTTP Alternative Services
+        b'user_pref("network.http.altsvc.enabled", false);\n',
+        # Disable Link Prefetching
+        b'user_pref("network.http.speculative-parallel-limit", 0);\n',
+        # Disable Offline Cache
+        b'user_pref("browser.cache.offline.enable", false);\n',
+        # Disable Browser Caching for SSL Content
+        b'user_pref("browser.cache.disk_cache_ssl", false);\n',
+    ),
+    'Disable Telemetry and Data Collection': (
+        # Disable Telemetry and Data Collection
+        (
+            b'user_pref("toolkit.telemetry.enabled", false);\n'
+            b'user_pref("toolkit.telemetry.unified", false);\n'
+            b'user_pref("toolkit.telemetry.archive.enabled", false);\n'
+            b'user_pref("datareporting.healthreport.uploadEnabled", false);\n'
+            b'user_pref("datareporting.policy.dataSubmissionEnabled", false);\n'
+            b'user_pref("browser.ping-centre.telemetry", false);\n'
+            b'user_pref("browser.newtabpage.activity-stream.feeds.telemetry", false);\n'
+            b'user_pref("browser.newtabpage.activity-stream.telemetry", false);\n'
+            b'user_pref("browser.discovery.enabled", false);\n'
+            b'user_pref("browser.contentblocking.report.enabled", false);\n'
+            b'user_pref("app.normandy.enabled", false);\n'
+            b'user_pref("app.shield.optoutstudies.enabled", false);\n'
+        ),
+        # Disable Telemetry Pings
+        (
+            b'user_pref("browser.ping-centre.telemetry", false);\n'
+            b'user_pref("browser.newtabpage.activity-stream.feeds.telemetry", false);\n'
+            b'user_pref("browser.newtabpage.activity-stream.telemetry", false);\n'
+        ),
+        # Disable Mozilla’s Extension Recommendations
+        b'user_pref("browser.newtabpage.activity-stream.asrouter.userprefs.cfr", false);\n',
+        # Disable Contextual Feature Recommender
+        b'user_pref("browser.newtabpage.activity-stream.asrouter.userprefs.cfr.addons", false);\n',
+        # Disable Telemetry Coverage
+        (
+            b'user_pref("toolkit.coverage.opt-out", true);\n'
+            b'user_pref("toolkit.coverage.endpoint.base", "");\n'
+        ),
+        # Disable Pocket
+        b'user_pref("extensions.pocket.enabled", false);\n',
+        # Disable Normandy/Shield
+        (
+            b'user_pref("app.normandy.enabled", false);\n'
+            b'user_pref("app.normandy.api_url", "");\n'
+        ),
+    ),
+    'Miscellaneous Settings': (
+        # Disable Password Manager
+        (
+            b'user_pref("signon.rememberSignons", false);\n'
+            b'user_pref("signon.autofillForms", false);\n'
+            b'user_pref("signon.formlessCapture.enabled", false);\n'
+        ),
+        # Disable Form Autofill
+        (
+            b'user_pref("browser.formfill.enable", false);\n'
+            b'user_pref("extensions.formautofill.available", "off");\n'
+            b'user_pref("extensions.formautofill.addresses.enabled", false);\n'
+            b'user_pref("extensions.formautofill.creditCards.enabled", false);\n'
+        ),
+        # Disable Clipboard Events
+        b'user_pref("dom.event.clipboardevents.enabled", false);\n',
+        # Disable WebGL
+        b'user_pref("webgl.disabled", true);\n',
+        # Disable Captive Portal Detection
+        b'user_pref("network.captive-portal-service.enabled", false);\n',
+        # Clear Data on Shutdown
+        (
+            b'user_pref("privacy.clearOnShutdown.cache", true);\n'
+            b'user_pref("privacy.clearOnShutdown.cookies", true);\n'
+            b'user_pref("privacy.clearOnShutdown.downloads", true);\n'
+            b'user_pref("privacy.clearOnShutdown.formdata", true);\n'
+            b'user_pref("privacy.clearOnShutdown.history", true);\n'
+            b'user_pref("privacy.clearOnShutdown.sessions", true);\n'
+            b'user_pref("privacy.sanitize.sanitizeOnShutdown", true);\n'
+        ),
+        # Disable Middle Mouse Paste
+        b'user_pref("middlemouse.contentLoadURL", false);\n',
+        # Disable Device Sensors
+        b'user_pref("device.sensors.enabled", false);\n',
+        # Disable Battery Status API
+        b'user_pref("dom.battery.enabled", false);\n',
+        # Disable Network Information API
+        b'user_pref("dom.netinfo.enabled", false);\n',
+        # Disable Resource Timing API
+        b'user_pref("dom.enable_resource_timing", false);\n',
+        # Disable Web Audio API
+        b'user_pref("dom.webaudio.enabled", false);\n',
+        # Disable Virtual Reality Devices
+        b'user_pref("dom.vr.enabled", false);\n',
+        # Disable Gamepad API
+        b'user_pref("dom.gamepad.enabled", false);\n',
+        # Disable Face Detection
+        b'user_pref("camera.control.face_detection.enabled", false);\n',
+    ),
+}
+
+CATEGORY_NAMES = tuple(CATEGORY_SETTINGS)
+
+# Extracts the preference name from a user_pref(...) line
+_PREF_KEY_RE = re.compile(rb'user_pref\("([^"]+)"')
+
+def _render_category(options):
+    """
+    Splits the settings of a category into user.js lines, dropping repeated preferences.
+
+    Args:
+        options (tuple): The encoded settings of each option in the category.
+
+    Returns:
+        tuple: (preference name, line) pairs in definition order.
+    """
+    seen = set()
+    lines = []
+    for settings in options:
+        for line in settings.splitlines(keepends=True):
+            key = _PREF_KEY_RE.match(line).group(1)
+            if key not in seen:
+                seen.add(key)
+                lines.append((key, line))
+    return tuple(lines)
+
+# Pre-rendered user.js lines for each category, indexed like CATEGORY_NAMES
+CATEGORY_PREFS = tuple(_render_category(options) for options in CATEGORY_SETTINGS.values())
+
+@functools.lru_cache(maxsize=None)
+def build_payload(category_indices):
+    """
+    Builds the user.js contents for a selection of categories.
+
+    Preferences shared by several categories are written only once, at their first occurrence.
+
+    Args:
+        category_indices (tuple): Indices into CATEGORY_NAMES, in the order to apply them.
+
+    Returns:
+        bytes: The complete user.js contents.
+    """
+    seen = set()
+    lines = []
+    for idx in category_indices:
+        for key, line in CATEGORY_PREFS[idx]:
+            if key not in seen:
+                seen.add(key)
+                lines.append(line)
+    return b''.join(lines)
+
+def get_category_docs():
+    """
+    Returns the description and details of every optimization option.
+
+    Applying settings only needs CATEGORY_SETTINGS, so these are built on request
+    and not kept alive for the whole session.
+
+    Returns:
+        dict: Tuples of (description, details) pairs keyed by category name,
+        in the same order as CATEGORY_SETTINGS.
+    """
+    return {
+        'Privacy Enhancements': (
+            ('Enable First-Party Isolation',
+             'Prevents cross-site tracking by isolating cookies and other site data to the first-party domain.'),
+            ('Resist Fingerprinting',
+             'Makes the browser more resistant to fingerprinting techniques by minimizing uniquely identifying information.'),
+            ('Enable Global Privacy Control',
+             'Sends a signal to websites expressing your preference for privacy.'),
+            ('Block Third-Party Cookies',
+             'Prevents third-party cookies used for cross-site tracking.'),
+            ('Disable Beacon API',
+             'Prevents tracking via the Beacon API.'),
+            ('Disable Search Suggestions',
+             'Prevents search queries from being sent to search engines prematurely.'),
+            ('Enable Strict Referrer Policy',
+             'Limits the amount of information sent in the HTTP Referer header.'),
+            ('Disable Network Prediction',
+             'Prevents Firefox from predicting network actions to reduce unnecessary connections.'),
+            ('Disable Search Suggestions in URL Bar',
+             'Prevents suggestions in the URL bar to enhance privacy.'),
+            ('Disable Telemetry Coverage',
+             'Disables telemetry coverage, preventing data collection.'),
+            ('Disable Battery Status API',
+             'Prevents websites from accessing battery status to reduce fingerprinting.'),
+            ('Disable Sensor APIs',
+             'Disables access to device sensors like gyroscope and accelerometer.'),
+            ('Disable Network Information API',
+             'Prevents access to network information.'),
+            ('Disable Resource Timing API',
+             'Prevents timing attacks by disabling the Resource Timing API.'),
+            ('Disable Web Audio API',
+             'Prevents fingerprinting via the AudioContext API.'),
+            ('Disable Virtual Reality Devices',
+             'Disables access to VR devices.'),
+            ('Disable Gamepad API',
+             'Prevents websites from accessing gamepad devices.'),
+            ('Disable Face Detection',
+             'Disables face detection capabilities.'),
+        ),
+        'Security Improvements': (
+            ('Enable HTTPS Only Mode',
+             'Forces all connections to use HTTPS, enhancing security.'),
+            ('Set Minimum TLS Version to 1.2',
+             'Enhances security by disallowing older, less secure TLS versions.'),
+            ('Disable WebRTC (Prevent IP Leak)',
+             'Disables WebRTC to prevent your real IP address from leaking when using VPNs.'),
+            ('Disable Geolocation',
+             'Prevents websites from requesting your physical location.'),
+            ('Disable JavaScript in PDF Viewer',
+             'Enhances security by disabling JavaScript execution in the built-in PDF viewer.'),
+            ('Disable Remote JAR Files',
+             'Prevents loading of Java ARchive (JAR) files from remote sources.'),
+            ('Disable SSL Session Identifiers',
+             'Prevents tracking via SSL session identifiers.'),
+            ('Disable Password Manager Autofill',
+             'Disables autofilling passwords to prevent unauthorized access.'),
+            ('Disable Third-Party Credentials',
+             'Prevents sending credentials to third-party sites.'),
+            ('Disable Form Autofill Credit Cards',
+             'Prevents storing credit card information.'),
+            ('Disable Microphone Access',
+             'Blocks all websites from accessing the microphone.'),
+            ('Disable Camera Access',
+             'Blocks all websites from accessing the camera.'),
+            ('Disable Media Device Enumeration',
+             'Prevents websites from enumerating media devices.'),
+            ('Disable Speech Recognition',
+             'Disables speech recognition features.'),
+            ('Disable Speech Synthesis',
+             'Disables speech synthesis features.'),
+            ('Disable WebGL Debug Info',
+             'Prevents exposure of graphics card information.'),
+        ),
+        'Performance Optimizations': (
+            ('Disable Prefetching and Speculative Connections',
+             'Prevents Firefox from making automatic connections to improve privacy and performance.'),
+            ('Disable DNS Prefetching',
+             'Prevents Firefox from pre-resolving domain names.'),
+            ('Disable IPv6',
+             'Disables IPv6 to prevent potential connectivity issues.'),
+            ('Disable HTTP2',
+             'Disables HTTP2 for compatibility with some proxies.'),
+            ('Disable HTTP Alternative Services',
+             'Prevents Firefox from making connections to alternative services.'),
+            ('Disable Link Prefetching',
+             'Prevents preloading of linked content.'),
+            ('Disable Offline Cache',
+             'Prevents websites from storing data for offline use.'),
+            ('Disable Browser Caching for SSL Content',
+             'Prevents caching of SSL content to enhance security.'),
+        ),
+        'Disable Telemetry and Data Collection': (
+            ('Disable Telemetry and Data Collection',
+             'Prevents Firefox from sending usage and technical data to Mozilla.'),
+            ('Disable Telemetry Pings',
+             'Prevents Firefox from sending additional telemetry pings.'),
+            ('Disable Mozilla’s Extension Recommendations',
+             'Prevents Firefox from recommending extensions based on browsing behavior.'),
+            ('Disable Contextual Feature Recommender',
+             'Prevents Firefox from suggesting features based on usage.'),
+            ('Disable Telemetry Coverage',
+             'Disables additional telemetry coverage pings.'),
+            ('Disable Pocket',
+             'Disables Pocket integration in Firefox.'),
+            ('Disable Normandy/Shield',
+             'Disables Normandy/Shield studies and experiments.'),
+        ),
+        'Miscellaneous Settings': (
+            ('Disable Password Manager',
+             'Prevents Firefox from storing and autofilling passwords.'),
+            ('Disable Form Autofill',
+             'Prevents Firefox from saving and autofilling form data.'),
+            ('Disable Clipboard Events',
+             'Prevents websites from detecting clipboard copy/paste actions.'),
+            ('Disable WebGL',
+             'Disables WebGL to prevent potential security risks and fingerprinting.'),
+            ('Disable Captive Portal Detection',
+             'Prevents Firefox from making connections to detect captive portals.'),
+            ('Clear Data on Shutdown',
+             'Configures Firefox to clear various types of data when it closes.'),
+            ('Disable Middle Mouse Paste',
+             'Prevents pasting clipboard content on middle-click to avoid accidental data leakage.'),
+            ('Disable Device Sensors',
+             'Disables access to device sensors like gyroscope and accelerometer.'),
+            ('Disable Battery Status API',
+             'Prevents websites from accessing battery status to reduce fingerprinting.'),
+            ('Disable Network Information API',
+             'Prevents access to network information.'),
+            ('Disable Resource Timing API',
+             'Prevents timing attacks by disabling the Resource Timing API.'),
+            ('Disable Web Audio API',
+             'Prevents fingerprinting via the AudioContext API.'),
+            ('Disable Virtual Reality Devices',
+             'Disables access to VR devices.'),
+            ('Disable Gamepad API',
+             'Prevents websites from accessing gamepad devices.'),
+            ('Disable Face Detection',
+             'Disables face detection capabilities.'),
+        ),
+    }
+
+# The settings and their descriptions are matched up by position, so check once at import
+_CATEGORY_DOCS = get_category_docs()
+if (tuple(_CATEGORY_DOCS) != CATEGORY_NAMES
+        or any(len(_CATEGORY_DOCS[name]) != len(CATEGORY_SETTINGS[name]) for name in CATEGORY_NAMES)):
+    raise RuntimeError('Category descriptions do not match CATEGORY_SETTINGS')
+del _CATEGORY_DOCS
+
 def banner():
     """
     Displays the script banner.
@@ -38,9 +462,102 @@ def banner():
 
 def clear_screen():
     """
-    Clears the terminal screen.
+    Clears the terminal screen using ANSI escape sequences.
+    """
+    sys.stdout.write('\x1b[H\x1b[2J')
+    sys.stdout.flush()
+
+# Home directory, resolved once at import
+_HOME = os.path.expanduser('~')
+
+# Release metadata from the last update check, used for conditional requests
+UPDATE_CACHE_PATH = os.path.join(_HOME, '.cache', 'firefox_optimizer', 'update.json')
+
+# Extracts tag_name from the release JSON without parsing the whole document
+_TAG_NAME_RE = re.compile(rb'"tag_name"\s*:\s*"([^"]+)"')
+
+def _profiles_ini_locations(*base_paths):
+    """
+    Pairs each Firefox data directory with the profiles.ini path inside it.
+
+    Returns:
+        list: (profiles.ini path, base path) tuples.
+    """
+    return [(os.path.join(base_path, 'profiles.ini'), base_path) for base_path in base_paths]
+
+def _linux_paths():
+    """
+    Returns the profiles.ini locations of standard and Snap Firefox installations on Linux.
+    """
+    return _profiles_ini_locations(
+        os.path.join(_HOME, '.mozilla', 'firefox'),  # Standard installation
+        os.path.join(_HOME, 'snap', 'firefox', 'common', '.mozilla', 'firefox'),  # Snap installation
+    )
+
+def _darwin_paths():
+    """
+    Returns the profiles.ini location on macOS.
+    """
+    return _profiles_ini_locations(os.path.join(_HOME, 'Library', 'Application Support', 'Firefox'))
+
+def _win_paths():
+    """
+    Returns the profiles.ini location on Windows, if APPDATA is set.
+    """
+    appdata = os.environ.get('APPDATA')
+    return _profiles_ini_locations(os.path.join(appdata, 'Mozilla', 'Firefox')) if appdata else []
+
+# Possible (profiles.ini, base path) locations for this platform, or None if it is unsupported
+_PATH_BUILDERS = {'linux': _linux_paths, 'darwin': _darwin_paths, 'win32': _win_paths}
+_PROFILES_INI_PATHS = next((build() for platform, build in _PATH_BUILDERS.items()
+                            if sys.platform.startswith(platform)), None)
+
+# Resolved profile paths keyed by (profiles.ini path, mtime, size)
+_PROFILES_CACHE = {}
+
+def parse_profiles_ini(profiles_ini_path):
+    """
+    Reads the Path and IsRelative keys of every [Profile*] section in profiles.ini.
+
+    Args:
+        profiles_ini_path (str): The path to the profiles.ini file.
+
+    Returns:
+        list: A list of (path, is_relative) tuples, one per profile with a Path.
+    """
+    with open(profiles_ini_path, encoding='utf-8') as f:
+        data = f.read()
+
+    sections = []
+    fields = None  # Key/value pairs of the current [Profile*] section
+    for line in data.splitlines():
+        line = line.strip()
+        if line.startswith('[') and line.endswith(']'):
+            fields = {} if line[1:-1].startswith('Profile') else None
+            if fields is not None:
+                sections.append(fields)
+        elif fields is not None and line and line[0] not in '#;':
+            key, _, value = line.partition('=')
+            fields[key.strip().lower()] = value.strip()
+
+    return [(fields['path'], fields.get('isrelative', '1') != '0')
+            for fields in sections if fields.get('path')]
+
+def list_subdirectories(path):
+    """
+    Lists the subdirectories of a directory with a single scandir call.
+
+    Args:
+        path (str): The directory to list.
+
+    Returns:
+        set: The case-normalized names of the subdirectories, empty if path cannot be read.
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    try:
+        with os.scandir(path) as entries:
+            return {os.path.normcase(entry.name) for entry in entries if entry.is_dir()}
+    except OSError:
+        return set()
 
 def get_firefox_profiles():
     """
@@ -51,64 +568,48 @@ def get_firefox_profiles():
     """
     profiles = []
 
-    # Define possible locations for profiles.ini
-    profiles_ini_paths = []
-
-    if sys.platform.startswith('linux'):
-        # Standard installation
-        standard_profiles_ini = os.path.expanduser('~/.mozilla/firefox/profiles.ini')
-        # Snap installation
-        snap_profiles_ini = os.path.expanduser('~/snap/firefox/common/.mozilla/firefox/profiles.ini')
-
-        profiles_ini_paths.extend([standard_profiles_ini, snap_profiles_ini])
-        base_paths = {
-            standard_profiles_ini: os.path.expanduser('~/.mozilla/firefox'),
-            snap_profiles_ini: os.path.expanduser('~/snap/firefox/common/.mozilla/firefox')
-        }
-
-    elif sys.platform == 'darwin':
-        # macOS
-        profiles_ini = os.path.expanduser('~/Library/Application Support/Firefox/profiles.ini')
-        profiles_ini_paths.append(profiles_ini)
-        base_paths = {
-            profiles_ini: os.path.expanduser('~/Library/Application Support/Firefox')
-        }
-
-    elif sys.platform.startswith('win'):
-        # Windows
-        profiles_ini = os.path.join(os.environ['APPDATA'], 'Mozilla', 'Firefox', 'profiles.ini')
-        profiles_ini_paths.append(profiles_ini)
-        base_paths = {
-            profiles_ini: os.path.join(os.environ['APPDATA'], 'Mozilla', 'Firefox')
-        }
-    else:
+    if _PROFILES_INI_PATHS is None:
         print('Unsupported operating system.')
         sys.exit(1)
 
     found_profiles_ini = False
+    subdirs = {}  # Directory listings keyed by parent path, read once each
+    seen = set()  # Profiles are processed in parallel, so each directory is listed once
 
-    for profiles_ini_path in profiles_ini_paths:
-        if os.path.exists(profiles_ini_path):
-            found_profiles_ini = True
-            base_path = base_paths[profiles_ini_path]
-            config = configparser.ConfigParser()
-            config.read(profiles_ini_path)
-
-            for section in config.sections():
-                if section.startswith('Profile'):
-                    path = config.get(section, 'Path', fallback=None)
-                    is_relative = config.getint(section, 'IsRelative', fallback=1)
-                    if path:
-                        if is_relative:
-                            profile_path = os.path.normpath(os.path.join(base_path, path))
-                        else:
-                            profile_path = os.path.normpath(path)
-                        if os.path.exists(profile_path):
-                            profiles.append(profile_path)
-                        else:
-                            print(f'Profile path does not exist: {profile_path}')
-        else:
+    for profiles_ini_path, base_path in _PROFILES_INI_PATHS:
+        try:
+            st = os.stat(profiles_ini_path)
+        except OSError:
             continue  # Try the next possible profiles.ini path
+        found_profiles_ini = True
+
+        # Reuse the previous parse while profiles.ini is unchanged
+        cache_key = (profiles_ini_path, st.st_mtime_ns, st.st_size)
+        profile_paths = _PROFILES_CACHE.get(cache_key)
+        if profile_paths is None:
+            try:
+                entries = parse_profiles_ini(profiles_ini_path)
+            except OSError:
+                continue  # An unreadable profiles.ini contributes no profiles
+            profile_paths = []
+            for path, is_relative in entries:
+                if is_relative:
+                    profile_paths.append(os.path.normpath(os.path.join(base_path, path)))
+                else:
+                    profile_paths.append(os.path.normpath(path))
+            _PROFILES_CACHE[cache_key] = profile_paths
+
+        for profile_path in profile_paths:
+            if os.path.normcase(profile_path) in seen:
+                continue  # Another profiles.ini entry names the same directory
+            seen.add(os.path.normcase(profile_path))
+            parent, name = os.path.split(profile_path)
+            if parent not in subdirs:
+                subdirs[parent] = list_subdirectories(parent)
+            if os.path.normcase(name) in subdirs[parent]:
+                profiles.append(profile_path)
+            else:
+                print(f'Profile path does not exist: {profile_path}')
 
     if not found_profiles_ini:
         print('No profiles.ini file found.')
@@ -128,14 +629,16 @@ def display_main_menu():
     """
     clear_screen()
     banner()
-    print("Firefox Optimizer - Firefox Security & Privacy Optimizer")
-    print("Please select an option:")
-    print("1. Apply optimization settings")
-    print("2. Backup current settings")
-    print("3. Restore settings from backup")
-    print("4. Reset to default settings")
-    print("5. Check for updates")
-    print("q. Quit")
+    sys.stdout.write(
+        "Firefox Optimizer - Firefox Security & Privacy Optimizer\n"
+        "Please select an option:\n"
+        "1. Apply optimization settings\n"
+        "2. Backup current settings\n"
+        "3. Restore settings from backup\n"
+        "4. Reset to default settings\n"
+        "5. Check for updates\n"
+        "q. Quit\n"
+    )
 
 def display_category_menu(categories):
     """
@@ -145,11 +648,11 @@ def display_category_menu(categories):
         categories (list): A list of category names.
     """
     clear_screen()
-    print("Optimization Categories:")
-    for idx, category in enumerate(categories, start=1):
-        print(f"{idx}. {category}")
-    print("\n0. Apply all categories")
-    print("b. Go back to main menu")
+    lines = ["Optimization Categories:"]
+    lines.extend(f"{idx}. {category}" for idx, category in enumerate(categories, start=1))
+    lines.append("\n0. Apply all categories")
+    lines.append("b. Go back to main menu")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def get_category_choices(categories):
     """
@@ -161,6 +664,7 @@ def get_category_choices(categories):
     Returns:
         list or None: A list of selected indices or None to go back.
     """
+    valid = frozenset(map(str, range(1, len(categories) + 1)))  # Accepted category numbers
     while True:
         display_category_menu(categories)
         choice = input("\nEnter the numbers of the categories to apply (comma-separated), 0 for all, or 'b' to go back: ").strip()
@@ -169,14 +673,209 @@ def get_category_choices(categories):
         elif choice == '0':
             return list(range(len(categories)))  # Apply all categories
         else:
-            try:
-                indices = [int(idx.strip()) - 1 for idx in choice.split(',')]
-                if all(0 <= idx < len(categories) for idx in indices):
-                    return indices
-                else:
-                    print("Invalid selection. Please choose valid category numbers.")
-            except ValueError:
-                print("Invalid input. Please enter numbers separated by commas.")
+            tokens = [token.strip() for token in choice.split(',')]
+            if all(token in valid for token in tokens):
+                return [int(token) - 1 for token in tokens]
+            print("Invalid input. Please enter valid category numbers separated by commas.")
+
+def remove_quietly(path):
+    """
+    Removes a file, ignoring errors; used to clean up temporary files after a failure.
+
+    Args:
+        path (str): The path to the file.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def sync_directory(path):
+    """
+    Flushes a directory's entries to disk so that renames within it survive a crash.
+
+    This is best-effort: directories cannot be opened for syncing on Windows, and
+    some network and FUSE filesystems reject it, in which case this does nothing.
+
+    Args:
+        path (str): The path to the directory.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # The rename has already happened; only its durability is not guaranteed
+
+def write_user_js(user_js, payload):
+    """
+    Atomically replaces user.js with the payload.
+
+    The payload is written to user.js.tmp through a raw file descriptor in a single
+    write, synced, and renamed over user.js, so a crash never leaves a partially
+    written file behind. The directory is synced once afterwards.
+
+    Args:
+        user_js (str): The path to the user.js file.
+        payload (bytes): The complete file contents.
+    """
+    tmp_path = user_js + '.tmp'
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(tmp_path, flags, 0o644)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, user_js)
+    except BaseException:
+        remove_quietly(tmp_path)
+        raise
+    sync_directory(os.path.dirname(user_js))
+
+def copy_file(src, dst):
+    """
+    Copies a file's contents and timestamps, replacing dst atomically.
+
+    On Linux the data is copied inside the kernel with os.copy_file_range; elsewhere,
+    or if the filesystem does not support it, a buffered copy is used instead. The
+    copy is made under a temporary name and renamed over dst, so dst is never left
+    truncated, even when it is a hard link to src.
+
+    Args:
+        src (str): The path to the file to copy.
+        dst (str): The path to the copy.
+    """
+    import shutil
+
+    tmp_path = dst + '.tmp'
+    with open(src, 'rb') as fsrc:
+        try:
+            with open(tmp_path, 'wb') as fdst:
+                st = os.fstat(fsrc.fileno())
+                if hasattr(os, 'copy_file_range'):
+                    remaining = st.st_size
+                    try:
+                        while remaining > 0:
+                            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                            if not copied:
+                                break
+                            remaining -= copied
+                    except OSError:
+                        pass  # Not supported here; the buffered copy below takes over
+                # Copies whatever copy_file_range did not; both share the file offsets
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp_path, dst)
+        except BaseException:
+            remove_quietly(tmp_path)
+            raise
+
+def link_backup(user_js, backup_js):
+    """
+    Preserves the current user.js as user.js.backup before it is rewritten.
+
+    The backup is a hard link to the existing file, so no data is copied and user.js
+    stays in place until write_user_js renames the new contents over it. The file is
+    copied instead on filesystems without hard links.
+
+    Args:
+        user_js (str): The path to the user.js file.
+        backup_js (str): The path to the backup file.
+
+    Raises:
+        FileNotFoundError: If there is no user.js to back up.
+    """
+    try:
+        try:
+            os.link(user_js, backup_js)
+        except FileExistsError:
+            os.remove(backup_js)  # Replace the previous backup
+            os.link(user_js, backup_js)
+    except OSError:
+        # Also reached when user.js is missing, which copy_file reports as FileNotFoundError
+        copy_file(user_js, backup_js)
+
+def apply_to_profile(profile_files, payload, selected_settings, payload_digest):
+    """
+    Backs up the user.js of a single profile, writes the selected settings and verifies them.
+
+    Args:
+        profile_files (tuple): The (profile, user.js, user.js.backup) paths.
+        payload (bytes): The complete user.js contents.
+        selected_settings (list): The encoded settings contained in the payload, one line each.
+        payload_digest (bytes): The BLAKE2b digest of the payload.
+
+    Returns:
+        str: The status messages for the profile.
+    """
+    profile, user_js, backup_js = profile_files
+    messages = []
+
+    # Backup existing user.js
+    try:
+        link_backup(user_js, backup_js)
+        messages.append(f"Existing user.js backed up to user.js.backup for profile: {profile}")
+    except FileNotFoundError:
+        messages.append(f"No existing user.js file to backup in profile: {profile}")
+    except Exception as e:
+        messages.append(f"Failed to backup existing user.js for profile {profile}: {e}")
+        return "\n".join(messages)  # Leave this profile untouched
+
+    # Write selected settings to user.js in a single write
+    messages.append(f"\nApplying settings to profile: {profile}")
+    try:
+        write_user_js(user_js, payload)
+        messages.append(f'{len(selected_settings)} settings applied to profile: {profile}')
+        messages.append(verify_settings(user_js, selected_settings, len(payload), payload_digest))
+    except Exception as e:
+        messages.append(f"An error occurred while writing to {user_js}: {e}")
+    return "\n".join(messages)
+
+def run_for_profiles(func, profiles):
+    """
+    Runs a per-profile operation on all profiles concurrently and prints its status messages.
+
+    The work is dominated by file I/O, so threads overlap the disk latency of each profile.
+    Messages are printed in profile order, in a single write, once all operations have finished.
+
+    Args:
+        func (callable): Takes a profile and returns a status message.
+        profiles (list): A list of Firefox profiles, as passed to func.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(profiles)))) as executor:
+        messages = list(executor.map(func, profiles))
+    sys.stdout.write("".join(message + "\n" for message in messages))
+    sys.stdout.flush()
+
+def backup_profile(profile):
+    """
+    Creates a backup of the current user.js settings for a single profile.
+
+    Args:
+        profile (str): The path to the Firefox profile.
+
+    Returns:
+        str: A status message.
+    """
+    user_js = os.path.join(profile, 'user.js')
+    backup_js = os.path.join(profile, 'user.js.backup')
+    try:
+        copy_file(user_js, backup_js)
+        return f"Backup created for profile: {profile}"
+    except FileNotFoundError:
+        return f"No user.js file found in profile: {profile}"
+    except Exception as e:
+        return f"Failed to create backup for profile {profile}: {e}"
 
 def backup_settings(profiles):
     """
@@ -185,17 +884,27 @@ def backup_settings(profiles):
     Args:
         profiles (list): A list of Firefox profile paths.
     """
-    for profile in profiles:
-        user_js = os.path.join(profile, 'user.js')
-        backup_js = os.path.join(profile, 'user.js.backup')
-        if os.path.exists(user_js):
-            try:
-                shutil.copy2(user_js, backup_js)
-                print(f"Backup created for profile: {profile}")
-            except Exception as e:
-                print(f"Failed to create backup for profile {profile}: {e}")
-        else:
-            print(f"No user.js file found in profile: {profile}")
+    run_for_profiles(backup_profile, profiles)
+
+def restore_profile(profile):
+    """
+    Restores settings from backup for a single profile.
+
+    Args:
+        profile (str): The path to the Firefox profile.
+
+    Returns:
+        str: A status message.
+    """
+    backup_js = os.path.join(profile, 'user.js.backup')
+    user_js = os.path.join(profile, 'user.js')
+    try:
+        copy_file(backup_js, user_js)
+        return f"Settings restored from backup for profile: {profile}"
+    except FileNotFoundError:
+        return f"No backup found for profile: {profile}"
+    except Exception as e:
+        return f"Failed to restore settings for profile {profile}: {e}"
 
 def restore_settings(profiles):
     """
@@ -204,17 +913,26 @@ def restore_settings(profiles):
     Args:
         profiles (list): A list of Firefox profile paths.
     """
-    for profile in profiles:
-        backup_js = os.path.join(profile, 'user.js.backup')
-        user_js = os.path.join(profile, 'user.js')
-        if os.path.exists(backup_js):
-            try:
-                shutil.copy2(backup_js, user_js)
-                print(f"Settings restored from backup for profile: {profile}")
-            except Exception as e:
-                print(f"Failed to restore settings for profile {profile}: {e}")
-        else:
-            print(f"No backup found for profile: {profile}")
+    run_for_profiles(restore_profile, profiles)
+
+def reset_profile(profile):
+    """
+    Resets settings to default by removing the user.js file of a single profile.
+
+    Args:
+        profile (str): The path to the Firefox profile.
+
+    Returns:
+        str: A status message.
+    """
+    user_js = os.path.join(profile, 'user.js')
+    try:
+        os.remove(user_js)
+        return f"user.js removed, settings reset to default for profile: {profile}"
+    except FileNotFoundError:
+        return f"No user.js file to remove in profile: {profile}"
+    except Exception as e:
+        return f"Failed to reset settings for profile {profile}: {e}"
 
 def reset_to_default(profiles):
     """
@@ -223,63 +941,146 @@ def reset_to_default(profiles):
     Args:
         profiles (list): A list of Firefox profile paths.
     """
-    for profile in profiles:
-        user_js = os.path.join(profile, 'user.js')
-        if os.path.exists(user_js):
-            try:
-                os.remove(user_js)
-                print(f"user.js removed, settings reset to default for profile: {profile}")
-            except Exception as e:
-                print(f"Failed to reset settings for profile {profile}: {e}")
-        else:
-            print(f"No user.js file to remove in profile: {profile}")
+    run_for_profiles(reset_profile, profiles)
+
+def load_update_cache():
+    """
+    Loads the release metadata cached by the previous update check.
+
+    Returns:
+        dict: The cached metadata, or an empty dict if there is none.
+    """
+    import json
+
+    try:
+        with open(UPDATE_CACHE_PATH, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_update_cache(cache):
+    """
+    Saves release metadata for the next update check.
+
+    Args:
+        cache (dict): The release metadata and its ETag.
+    """
+    import json
+
+    try:
+        os.makedirs(os.path.dirname(UPDATE_CACHE_PATH), exist_ok=True)
+        with open(UPDATE_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # The cache only saves bandwidth; failing to write it is harmless
+
+def normalize_version(tag_name):
+    """
+    Strips the leading 'v' from a release tag.
+
+    Args:
+        tag_name (str): The release tag, e.g. 'v1.0.0'.
+
+    Returns:
+        str: The bare version number.
+    """
+    return tag_name[1:] if tag_name.startswith('v') else tag_name
+
+def fetch_latest_release():
+    """
+    Fetches the latest release metadata from GitHub.
+
+    The ETag of the previous response is sent with the request, so an unchanged
+    release is answered with 304 Not Modified and served from the local cache.
+
+    Returns:
+        dict: The release's tag_name, plus its assets when it is newer than this script.
+    """
+    import json
+    import urllib.error
+    import urllib.request
+
+    repo_url = "https://api.github.com/repos/Aerobit/FirefoxOptimizer/releases/latest"
+    cache = load_update_cache()
+    headers = {}
+    # A cached release is only usable if it carries the assets an update would need
+    if 'etag' in cache and 'tag_name' in cache and (
+            'assets' in cache or normalize_version(cache['tag_name']) == __version__):
+        headers['If-None-Match'] = cache['etag']
+    try:
+        with urllib.request.urlopen(urllib.request.Request(repo_url, headers=headers)) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP Status Code: {response.status}")
+            body = response.read()
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and headers:
+            return cache  # Release unchanged since the last check
+        raise
+
+    match = _TAG_NAME_RE.search(body)
+    if match is None:
+        raise ValueError("tag_name not found in the release metadata")
+    release = {'tag_name': match.group(1).decode()}
+    if normalize_version(release['tag_name']) != __version__:
+        # Only parse the full release JSON when the asset URLs are actually needed
+        data = json.loads(body)
+        release['assets'] = [{'name': asset['name'], 'browser_download_url': asset['browser_download_url']}
+                             for asset in data.get('assets', [])]
+    if etag:
+        save_update_cache(dict(release, etag=etag))
+    return release
 
 def update_script():
     """
     Checks for updates to the script on GitHub and updates if a new version is available.
     """
+    import shutil
+    import urllib.request
+
     print("\nChecking for updates...")
-    repo_url = "https://api.github.com/repos/Aerobit/FirefoxOptimizer/releases/latest"
     try:
-        with urllib.request.urlopen(repo_url) as response:
-            if response.status != 200:
-                print(f"Failed to check for updates. HTTP Status Code: {response.status}")
-                return
-            data = json.loads(response.read().decode())
-            latest_version = data['tag_name']
-            if latest_version.startswith('v'):
-                latest_version = latest_version[1:]
-            if latest_version != __version__:
-                print(f"A new version ({latest_version}) is available.")
-                assets = data.get('assets', [])
-                if assets:
-                    # Find the asset with the script name
-                    download_url = None
-                    for asset in assets:
-                        if asset['name'] == 'firefox_optimizer.py':
-                            download_url = asset['browser_download_url']
-                            break
-                    if download_url:
-                        choice = input("Do you want to update now? (y/n): ").strip().lower()
-                        if choice == 'y':
-                            # Download and replace the current script
-                            script_url = download_url
-                            script_path = os.path.abspath(__file__)
+        data = fetch_latest_release()
+        latest_version = normalize_version(data['tag_name'])
+        if latest_version != __version__:
+            print(f"A new version ({latest_version}) is available.")
+            assets = data.get('assets', [])
+            if assets:
+                # Find the asset with the script name
+                download_url = None
+                for asset in assets:
+                    if asset['name'] == 'firefox_optimizer.py':
+                        download_url = asset['browser_download_url']
+                        break
+                if download_url:
+                    choice = input("Do you want to update now? (y/n): ").strip().lower()
+                    if choice == 'y':
+                        # Download next to the current script, then swap it in atomically
+                        script_url = download_url
+                        script_path = os.path.abspath(__file__)
+                        new_script_path = script_path + '.new'
+                        try:
+                            with urllib.request.urlopen(script_url) as response, open(new_script_path, 'wb') as out_file:
+                                shutil.copyfileobj(response, out_file, COPY_BUFSIZE)
+                            shutil.copymode(script_path, new_script_path)
+                            os.replace(new_script_path, script_path)
+                            print(f"Firefox Optimizer has been updated to version {latest_version}. Please restart the script.")
+                            sys.exit(0)
+                        except Exception as e:
+                            print(f"Failed to download or replace the script: {e}")
                             try:
-                                with urllib.request.urlopen(script_url) as response, open(script_path, 'wb') as out_file:
-                                    shutil.copyfileobj(response, out_file)
-                                print(f"Firefox Optimizer has been updated to version {latest_version}. Please restart the script.")
-                                sys.exit(0)
-                            except Exception as e:
-                                print(f"Failed to download or replace the script: {e}")
-                        else:
-                            print("Update canceled.")
+                                os.remove(new_script_path)
+                            except OSError:
+                                pass
                     else:
-                        print("Download URL for the script not found in the latest release.")
+                        print("Update canceled.")
                 else:
-                    print("No downloadable assets found in the latest release.")
+                    print("Download URL for the script not found in the latest release.")
             else:
-                print("You are using the latest version of Firefox Optimizer.")
+                print("No downloadable assets found in the latest release.")
+        else:
+            print("You are using the latest version of Firefox Optimizer.")
     except Exception as e:
         print(f"Failed to check for updates: {e}")
 
@@ -290,6 +1091,9 @@ def optimize_firefox():
     clear_screen()
     banner()
     profiles = get_firefox_profiles()
+    # (profile, user.js, user.js.backup) paths, joined once for the whole session
+    profile_files = [(profile, os.path.join(profile, 'user.js'), os.path.join(profile, 'user.js.backup'))
+                     for profile in profiles]
 
     while True:
         display_main_menu()
@@ -302,454 +1106,17 @@ def optimize_firefox():
             if proceed != 'y':
                 continue
 
-            # Define optimization settings grouped by categories
-            optimization_categories = {
-                'Privacy Enhancements': [
-                    {
-                        'description': 'Enable First-Party Isolation',
-                        'details': 'Prevents cross-site tracking by isolating cookies and other site data to the first-party domain.',
-                        'settings': ['user_pref("privacy.firstparty.isolate", true);']
-                    },
-                    {
-                        'description': 'Resist Fingerprinting',
-                        'details': 'Makes the browser more resistant to fingerprinting techniques by minimizing uniquely identifying information.',
-                        'settings': ['user_pref("privacy.resistFingerprinting", true);']
-                    },
-                    {
-                        'description': 'Enable Global Privacy Control',
-                        'details': 'Sends a signal to websites expressing your preference for privacy.',
-                        'settings': ['user_pref("privacy.globalprivacycontrol.enabled", true);']
-                    },
-                    {
-                        'description': 'Block Third-Party Cookies',
-                        'details': 'Prevents third-party cookies used for cross-site tracking.',
-                        'settings': [
-                            'user_pref("network.cookie.cookieBehavior", 1);',
-                            'user_pref("network.cookie.thirdparty.nonsecureSessionOnly", true);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Beacon API',
-                        'details': 'Prevents tracking via the Beacon API.',
-                        'settings': ['user_pref("beacon.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Search Suggestions',
-                        'details': 'Prevents search queries from being sent to search engines prematurely.',
-                        'settings': ['user_pref("browser.search.suggest.enabled", false);']
-                    },
-                    {
-                        'description': 'Enable Strict Referrer Policy',
-                        'details': 'Limits the amount of information sent in the HTTP Referer header.',
-                        'settings': ['user_pref("network.http.referer.XOriginPolicy", 2);']
-                    },
-                    {
-                        'description': 'Disable Network Prediction',
-                        'details': 'Prevents Firefox from predicting network actions to reduce unnecessary connections.',
-                        'settings': ['user_pref("network.predictor.enable-hover-on-ssl", false);']
-                    },
-                    {
-                        'description': 'Disable Search Suggestions in URL Bar',
-                        'details': 'Prevents suggestions in the URL bar to enhance privacy.',
-                        'settings': ['user_pref("browser.urlbar.suggest.searches", false);']
-                    },
-                    {
-                        'description': 'Disable Telemetry Coverage',
-                        'details': 'Disables telemetry coverage, preventing data collection.',
-                        'settings': ['user_pref("toolkit.coverage.opt-out", true);']
-                    },
-                    {
-                        'description': 'Disable Battery Status API',
-                        'details': 'Prevents websites from accessing battery status to reduce fingerprinting.',
-                        'settings': ['user_pref("dom.battery.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Sensor APIs',
-                        'details': 'Disables access to device sensors like gyroscope and accelerometer.',
-                        'settings': ['user_pref("device.sensors.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Network Information API',
-                        'details': 'Prevents access to network information.',
-                        'settings': ['user_pref("dom.netinfo.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Resource Timing API',
-                        'details': 'Prevents timing attacks by disabling the Resource Timing API.',
-                        'settings': ['user_pref("dom.enable_resource_timing", false);']
-                    },
-                    {
-                        'description': 'Disable Web Audio API',
-                        'details': 'Prevents fingerprinting via the AudioContext API.',
-                        'settings': ['user_pref("dom.webaudio.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Virtual Reality Devices',
-                        'details': 'Disables access to VR devices.',
-                        'settings': ['user_pref("dom.vr.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Gamepad API',
-                        'details': 'Prevents websites from accessing gamepad devices.',
-                        'settings': ['user_pref("dom.gamepad.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Face Detection',
-                        'details': 'Disables face detection capabilities.',
-                        'settings': ['user_pref("camera.control.face_detection.enabled", false);']
-                    },
-                ],
-                'Security Improvements': [
-                    {
-                        'description': 'Enable HTTPS Only Mode',
-                        'details': 'Forces all connections to use HTTPS, enhancing security.',
-                        'settings': ['user_pref("dom.security.https_only_mode", true);']
-                    },
-                    {
-                        'description': 'Set Minimum TLS Version to 1.2',
-                        'details': 'Enhances security by disallowing older, less secure TLS versions.',
-                        'settings': ['user_pref("security.tls.version.min", 3);']
-                    },
-                    {
-                        'description': 'Disable WebRTC (Prevent IP Leak)',
-                        'details': 'Disables WebRTC to prevent your real IP address from leaking when using VPNs.',
-                        'settings': [
-                            'user_pref("media.peerconnection.enabled", false);',
-                            'user_pref("media.peerconnection.use_document_iceservers", false);',
-                            'user_pref("media.peerconnection.video.enabled", false);',
-                            'user_pref("media.peerconnection.identity.timeout", 1);',
-                            'user_pref("media.peerconnection.turn.disable", true);',
-                            'user_pref("media.peerconnection.ice.no_host", true);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Geolocation',
-                        'details': 'Prevents websites from requesting your physical location.',
-                        'settings': [
-                            'user_pref("geo.enabled", false);',
-                            'user_pref("geo.provider.use_corelocation", false);',
-                            'user_pref("geo.provider.ms-windows-location", false);',
-                            'user_pref("geo.provider.use_gpsd", false);',
-                            'user_pref("browser.search.geoip.url", "");',
-                            'user_pref("permissions.default.geo", 2);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable JavaScript in PDF Viewer',
-                        'details': 'Enhances security by disabling JavaScript execution in the built-in PDF viewer.',
-                        'settings': ['user_pref("pdfjs.enableScripting", false);']
-                    },
-                    {
-                        'description': 'Disable Remote JAR Files',
-                        'details': 'Prevents loading of Java ARchive (JAR) files from remote sources.',
-                        'settings': ['user_pref("network.jar.block-remote-files", true);']
-                    },
-                    {
-                        'description': 'Disable SSL Session Identifiers',
-                        'details': 'Prevents tracking via SSL session identifiers.',
-                        'settings': ['user_pref("security.ssl.disable_session_identifiers", true);']
-                    },
-                    {
-                        'description': 'Disable Password Manager Autofill',
-                        'details': 'Disables autofilling passwords to prevent unauthorized access.',
-                        'settings': ['user_pref("signon.autofillForms", false);']
-                    },
-                    {
-                        'description': 'Disable Third-Party Credentials',
-                        'details': 'Prevents sending credentials to third-party sites.',
-                        'settings': ['user_pref("network.http.sendRefererHeader", 0);']
-                    },
-                    {
-                        'description': 'Disable Form Autofill Credit Cards',
-                        'details': 'Prevents storing credit card information.',
-                        'settings': ['user_pref("extensions.formautofill.creditCards.available", false);']
-                    },
-                    {
-                        'description': 'Disable Microphone Access',
-                        'details': 'Blocks all websites from accessing the microphone.',
-                        'settings': ['user_pref("permissions.default.microphone", 2);']
-                    },
-                    {
-                        'description': 'Disable Camera Access',
-                        'details': 'Blocks all websites from accessing the camera.',
-                        'settings': ['user_pref("permissions.default.camera", 2);']
-                    },
-                    {
-                        'description': 'Disable Media Device Enumeration',
-                        'details': 'Prevents websites from enumerating media devices.',
-                        'settings': [
-                            'user_pref("media.navigator.enabled", false);',
-                            'user_pref("media.navigator.permission.disabled", true);',
-                            'user_pref("media.navigator.video.enabled", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Speech Recognition',
-                        'details': 'Disables speech recognition features.',
-                        'settings': ['user_pref("media.webspeech.recognition.enable", false);']
-                    },
-                    {
-                        'description': 'Disable Speech Synthesis',
-                        'details': 'Disables speech synthesis features.',
-                        'settings': ['user_pref("media.webspeech.synth.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable WebGL Debug Info',
-                        'details': 'Prevents exposure of graphics card information.',
-                        'settings': ['user_pref("webgl.enable-debug-renderer-info", false);']
-                    },
-                ],
-                'Performance Optimizations': [
-                    {
-                        'description': 'Disable Prefetching and Speculative Connections',
-                        'details': 'Prevents Firefox from making automatic connections to improve privacy and performance.',
-                        'settings': [
-                            'user_pref("network.prefetch-next", false);',
-                            'user_pref("network.predictor.enabled", false);',
-                            'user_pref("network.predictor.enable-prefetch", false);',
-                            'user_pref("network.http.speculative-parallel-limit", 0);',
-                            'user_pref("browser.urlbar.speculativeConnect.enabled", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable DNS Prefetching',
-                        'details': 'Prevents Firefox from pre-resolving domain names.',
-                        'settings': [
-                            'user_pref("network.dns.disablePrefetch", true);',
-                            'user_pref("network.dns.disablePrefetchFromHTTPS", true);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable IPv6',
-                        'details': 'Disables IPv6 to prevent potential connectivity issues.',
-                        'settings': ['user_pref("network.dns.disableIPv6", true);']
-                    },
-                    {
-                        'description': 'Disable HTTP2',
-                        'details': 'Disables HTTP2 for compatibility with some proxies.',
-                        'settings': ['user_pref("network.http.spdy.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable HTTP Alternative Services',
-                        'details': 'Prevents Firefox from making connections to alternative services.',
-                        'settings': ['user_pref("network.http.altsvc.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Link Prefetching',
-                        'details': 'Prevents preloading of linked content.',
-                        'settings': ['user_pref("network.http.speculative-parallel-limit", 0);']
-                    },
-                    {
-                        'description': 'Disable Offline Cache',
-                        'details': 'Prevents websites from storing data for offline use.',
-                        'settings': ['user_pref("browser.cache.offline.enable", false);']
-                    },
-                    {
-                        'description': 'Disable Browser Caching for SSL Content',
-                        'details': 'Prevents caching of SSL content to enhance security.',
-                        'settings': ['user_pref("browser.cache.disk_cache_ssl", false);']
-                    },
-                ],
-                'Disable Telemetry and Data Collection': [
-                    {
-                        'description': 'Disable Telemetry and Data Collection',
-                        'details': 'Prevents Firefox from sending usage and technical data to Mozilla.',
-                        'settings': [
-                            'user_pref("toolkit.telemetry.enabled", false);',
-                            'user_pref("toolkit.telemetry.unified", false);',
-                            'user_pref("toolkit.telemetry.archive.enabled", false);',
-                            'user_pref("datareporting.healthreport.uploadEnabled", false);',
-                            'user_pref("datareporting.policy.dataSubmissionEnabled", false);',
-                            'user_pref("browser.ping-centre.telemetry", false);',
-                            'user_pref("browser.newtabpage.activity-stream.feeds.telemetry", false);',
-                            'user_pref("browser.newtabpage.activity-stream.telemetry", false);',
-                            'user_pref("browser.discovery.enabled", false);',
-                            'user_pref("browser.contentblocking.report.enabled", false);',
-                            'user_pref("app.normandy.enabled", false);',
-                            'user_pref("app.shield.optoutstudies.enabled", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Telemetry Pings',
-                        'details': 'Prevents Firefox from sending additional telemetry pings.',
-                        'settings': [
-                            'user_pref("browser.ping-centre.telemetry", false);',
-                            'user_pref("browser.newtabpage.activity-stream.feeds.telemetry", false);',
-                            'user_pref("browser.newtabpage.activity-stream.telemetry", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Mozilla’s Extension Recommendations',
-                        'details': 'Prevents Firefox from recommending extensions based on browsing behavior.',
-                        'settings': ['user_pref("browser.newtabpage.activity-stream.asrouter.userprefs.cfr", false);']
-                    },
-                    {
-                        'description': 'Disable Contextual Feature Recommender',
-                        'details': 'Prevents Firefox from suggesting features based on usage.',
-                        'settings': ['user_pref("browser.newtabpage.activity-stream.asrouter.userprefs.cfr.addons", false);']
-                    },
-                    {
-                        'description': 'Disable Telemetry Coverage',
-                        'details': 'Disables additional telemetry coverage pings.',
-                        'settings': [
-                            'user_pref("toolkit.coverage.opt-out", true);',
-                            'user_pref("toolkit.coverage.endpoint.base", "");'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Pocket',
-                        'details': 'Disables Pocket integration in Firefox.',
-                        'settings': ['user_pref("extensions.pocket.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Normandy/Shield',
-                        'details': 'Disables Normandy/Shield studies and experiments.',
-                        'settings': [
-                            'user_pref("app.normandy.enabled", false);',
-                            'user_pref("app.normandy.api_url", "");'
-                        ]
-                    },
-                ],
-                'Miscellaneous Settings': [
-                    {
-                        'description': 'Disable Password Manager',
-                        'details': 'Prevents Firefox from storing and autofilling passwords.',
-                        'settings': [
-                            'user_pref("signon.rememberSignons", false);',
-                            'user_pref("signon.autofillForms", false);',
-                            'user_pref("signon.formlessCapture.enabled", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Form Autofill',
-                        'details': 'Prevents Firefox from saving and autofilling form data.',
-                        'settings': [
-                            'user_pref("browser.formfill.enable", false);',
-                            'user_pref("extensions.formautofill.available", "off");',
-                            'user_pref("extensions.formautofill.addresses.enabled", false);',
-                            'user_pref("extensions.formautofill.creditCards.enabled", false);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Clipboard Events',
-                        'details': 'Prevents websites from detecting clipboard copy/paste actions.',
-                        'settings': ['user_pref("dom.event.clipboardevents.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable WebGL',
-                        'details': 'Disables WebGL to prevent potential security risks and fingerprinting.',
-                        'settings': ['user_pref("webgl.disabled", true);']
-                    },
-                    {
-                        'description': 'Disable Captive Portal Detection',
-                        'details': 'Prevents Firefox from making connections to detect captive portals.',
-                        'settings': ['user_pref("network.captive-portal-service.enabled", false);']
-                    },
-                    {
-                        'description': 'Clear Data on Shutdown',
-                        'details': 'Configures Firefox to clear various types of data when it closes.',
-                        'settings': [
-                            'user_pref("privacy.clearOnShutdown.cache", true);',
-                            'user_pref("privacy.clearOnShutdown.cookies", true);',
-                            'user_pref("privacy.clearOnShutdown.downloads", true);',
-                            'user_pref("privacy.clearOnShutdown.formdata", true);',
-                            'user_pref("privacy.clearOnShutdown.history", true);',
-                            'user_pref("privacy.clearOnShutdown.sessions", true);',
-                            'user_pref("privacy.sanitize.sanitizeOnShutdown", true);'
-                        ]
-                    },
-                    {
-                        'description': 'Disable Middle Mouse Paste',
-                        'details': 'Prevents pasting clipboard content on middle-click to avoid accidental data leakage.',
-                        'settings': ['user_pref("middlemouse.contentLoadURL", false);']
-                    },
-                    {
-                        'description': 'Disable Device Sensors',
-                        'details': 'Disables access to device sensors like gyroscope and accelerometer.',
-                        'settings': ['user_pref("device.sensors.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Battery Status API',
-                        'details': 'Prevents websites from accessing battery status to reduce fingerprinting.',
-                        'settings': ['user_pref("dom.battery.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Network Information API',
-                        'details': 'Prevents access to network information.',
-                        'settings': ['user_pref("dom.netinfo.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Resource Timing API',
-                        'details': 'Prevents timing attacks by disabling the Resource Timing API.',
-                        'settings': ['user_pref("dom.enable_resource_timing", false);']
-                    },
-                    {
-                        'description': 'Disable Web Audio API',
-                        'details': 'Prevents fingerprinting via the AudioContext API.',
-                        'settings': ['user_pref("dom.webaudio.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Virtual Reality Devices',
-                        'details': 'Disables access to VR devices.',
-                        'settings': ['user_pref("dom.vr.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Gamepad API',
-                        'details': 'Prevents websites from accessing gamepad devices.',
-                        'settings': ['user_pref("dom.gamepad.enabled", false);']
-                    },
-                    {
-                        'description': 'Disable Face Detection',
-                        'details': 'Disables face detection capabilities.',
-                        'settings': ['user_pref("camera.control.face_detection.enabled", false);']
-                    },
-                ]
-            }
-
-            categories = list(optimization_categories.keys())
+            categories = CATEGORY_NAMES
             selected_category_indices = get_category_choices(categories)
             if selected_category_indices is None:
                 continue  # Go back to main menu
 
-            # Compile selected settings
-            selected_settings = []
-            for idx in selected_category_indices:
-                category = categories[idx]
-                options = optimization_categories[category]
-                for option in options:
-                    selected_settings.extend(option['settings'])
-
-            total_settings = len(selected_settings)
-            for profile in profiles:
-                user_js = os.path.join(profile, 'user.js')
-                backup_js = os.path.join(profile, 'user.js.backup')
-
-                # Backup existing user.js
-                if os.path.exists(user_js):
-                    try:
-                        shutil.copy2(user_js, backup_js)
-                        print(f"Existing user.js backed up to user.js.backup for profile: {profile}")
-                    except Exception as e:
-                        print(f"Failed to backup existing user.js for profile {profile}: {e}")
-                        continue  # Skip to next profile
-                else:
-                    print(f"No existing user.js file to backup in profile: {profile}")
-
-                # Write selected settings to user.js with progress display
-                print(f"\nApplying settings to profile: {profile}")
-                try:
-                    with open(user_js, 'w') as f:
-                        for index, setting in enumerate(selected_settings, start=1):
-                            f.write(setting + '\n')
-                            # Display progress
-                            progress = (index / total_settings) * 100
-                            print(f'Applying setting {index}/{total_settings} ({progress:.2f}%)', end='\r')
-                    print(f'\nSettings applied to profile: {profile}')
-                    # Verification
-                    verify_settings(profile, selected_settings)
-                except Exception as e:
-                    print(f"An error occurred while writing to {user_js}: {e}")
-                    continue  # Proceed to next profile
+            # Compile selected settings; the same payload is written to every profile
+            payload = build_payload(tuple(selected_category_indices))
+            payload_digest = hashlib.blake2b(payload).digest()
+            selected_settings = payload.splitlines()
+            run_for_profiles(functools.partial(apply_to_profile, payload=payload, selected_settings=selected_settings,
+                                               payload_digest=payload_digest), profile_files)
 
             input("\nPress Enter to return to the main menu...")
 
@@ -776,32 +1143,40 @@ def optimize_firefox():
             print("Invalid choice. Please select a valid option.")
             input("\nPress Enter to continue...")
 
-def verify_settings(profile, selected_settings):
+def verify_settings(user_js, selected_settings, expected_size, expected_digest):
     """
     Verifies that the settings have been applied correctly.
 
+    The file is first compared against the size and digest of the written contents;
+    the per-setting check only runs on a mismatch, to report what is missing.
+
     Args:
-        profile (str): The path to the Firefox profile.
-        selected_settings (list): The list of settings that were applied.
+        user_js (str): The path to the profile's user.js file.
+        selected_settings (list): The encoded settings that were applied, one line each.
+        expected_size (int): The size in bytes of the user.js contents that were written.
+        expected_digest (bytes): The BLAKE2b digest of the user.js contents that were written.
+
+    Returns:
+        str: A status message describing the result.
     """
-    user_js = os.path.join(profile, 'user.js')
     try:
-        with open(user_js, 'r') as f:
-            applied_settings = f.readlines()
+        with open(user_js, 'rb') as f:
+            contents = f.read()
 
-        missing_settings = []
-        for setting in selected_settings:
-            if setting.strip() + '\n' not in applied_settings:
-                missing_settings.append(setting)
+        if len(contents) == expected_size and hashlib.blake2b(contents).digest() == expected_digest:
+            missing_settings = []
+        else:
+            applied_settings = {line.strip() for line in contents.splitlines()}
+            missing_settings = [setting for setting in selected_settings if setting not in applied_settings]
 
         if not missing_settings:
-            print('All selected settings have been successfully applied and verified.')
-        else:
-            print('The following settings were not applied correctly:')
-            for s in missing_settings:
-                print(s)
+            return 'All selected settings have been successfully applied and verified.'
+        return '\n'.join(['The following settings were not applied correctly:']
+                         + [setting.decode() for setting in missing_settings])
     except Exception as e:
-        print(f"Failed to verify settings for profile {profile}: {e}")
+        return f"Failed to verify settings in {user_js}: {e}"
 
 if __name__ == '__main__':
+    if os.name == 'nt':
+        os.system('')  # Enables ANSI escape sequence processing in the Windows console
     optimize_firefox()